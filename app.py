@@ -3,15 +3,50 @@ import time
 import datetime
 import platform
 import os
-import json
-from flask import Flask, render_template, jsonify
+import atexit
+import gzip
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from flask import Flask, Response, render_template, request
+from flask_compress import Compress
 
 app = Flask(__name__)
+# Gzip JSON responses with a fast compression level; the SSE stream is left
+# alone because flask-compress would buffer it before sending anything. The
+# default /api/system_info body is gzipped once per snapshot by the sampler.
+app.config["COMPRESS_ALGORITHM"] = "gzip"
+app.config["COMPRESS_LEVEL"] = 1
+app.config["COMPRESS_MIN_SIZE"] = 500
+app.config["COMPRESS_STREAMS"] = False
+Compress(app)
+
+# The logical CPU count does not change while the process is running
+CPU_COUNT = psutil.cpu_count()
+
+# Units for _format_bytes, one step per power of 1024
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Column order of each row in get_process_info()'s "rows"
+PROC_KEYS = ('pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'rss', 'create_time')
+
+# Byte counts that ?format=1 pairs with a human-readable "<field>_formatted"
+FORMATTED_FIELDS = frozenset(('total', 'available', 'used', 'free', 'read_bytes',
+                              'write_bytes', 'bytes_sent', 'bytes_recv', 'rss'))
 
 class SystemMonitor:
-    def get_system_info(self):
-        """Get basic system information."""
-        return {
+    # Mounts rarely change and per-mount usage moves slowly, so both are
+    # refreshed less often than the rest of the snapshot
+    PARTITIONS_TTL = 30.0
+    DISK_USAGE_TTL = 2.0
+    # Pseudo filesystems that are not worth a statvfs call
+    SKIP_FSTYPES = frozenset(('tmpfs', 'devtmpfs', 'squashfs', 'overlay'))
+
+    def __init__(self):
+        # Platform details are fixed for the life of the process, and some
+        # (e.g. processor) shell out or read /proc, so look them up once
+        self._system_info = {
             "system": platform.system(),
             "node": platform.node(),
             "release": platform.release(),
@@ -19,14 +54,33 @@ class SystemMonitor:
             "machine": platform.machine(),
             "processor": platform.processor()
         }
+        # Pre-encoded once so snapshots can splice it in without re-encoding
+        self._system_json = orjson.dumps(self._system_info)
+        # (monotonic time, partitions) and {mountpoint: (monotonic time, usage)}
+        self._parts_cache = (0.0, None)
+        self._usage_cache = {}
+        # Collectors spend most of their time in psutil's C code and /proc
+        # reads, which release the GIL, so they can overlap in threads
+        self._pool = ThreadPoolExecutor(max_workers=3)
+
+    def get_system_info(self):
+        """Get basic system information."""
+        return self._system_info
         
     def get_cpu_info(self):
-        """Get CPU usage information."""
+        """Get CPU usage information.
+
+        Percentages are measured since the previous call rather than over a
+        blocking sleep, so they cover the sampler's interval. psutil keeps
+        that baseline per thread, so this must always run on the same thread.
+        """
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+        freq = psutil.cpu_freq()
         return {
-            "cpu_percent": psutil.cpu_percent(interval=0.1),
-            "cpu_count": psutil.cpu_count(),
-            "cpu_freq": psutil.cpu_freq().current if psutil.cpu_freq() else "N/A",
-            "per_cpu": psutil.cpu_percent(interval=0.1, percpu=True)
+            "cpu_percent": round(sum(per_cpu) / len(per_cpu), 1) if per_cpu else 0.0,
+            "cpu_count": CPU_COUNT,
+            "cpu_freq": freq.current if freq else "N/A",
+            "per_cpu": per_cpu
         }
         
     def get_memory_info(self):
@@ -36,22 +90,21 @@ class SystemMonitor:
             "total": memory.total,
             "available": memory.available,
             "used": memory.used,
-            "percent": memory.percent,
-            "total_formatted": self._format_bytes(memory.total),
-            "available_formatted": self._format_bytes(memory.available),
-            "used_formatted": self._format_bytes(memory.used)
+            "percent": memory.percent
         }
         
     def get_disk_info(self):
         """Get disk usage information."""
-        disk = psutil.disk_usage('/')
         io_counters = psutil.disk_io_counters()
         
-        # Get all disk partitions
+        # Get all disk partitions, picking up the root filesystem on the way
+        disk = None
         partitions = []
-        for partition in psutil.disk_partitions():
+        for partition in self._get_partitions():
             try:
-                usage = psutil.disk_usage(partition.mountpoint)
+                usage = self._get_disk_usage(partition.mountpoint)
+                if partition.mountpoint == '/':
+                    disk = usage
                 partitions.append({
                     "device": partition.device,
                     "mountpoint": partition.mountpoint,
@@ -59,53 +112,71 @@ class SystemMonitor:
                     "total": usage.total,
                     "used": usage.used,
                     "free": usage.free,
-                    "percent": usage.percent,
-                    "total_formatted": self._format_bytes(usage.total),
-                    "used_formatted": self._format_bytes(usage.used),
-                    "free_formatted": self._format_bytes(usage.free)
+                    "percent": usage.percent
                 })
             except (PermissionError, OSError):
                 # Some mount points may not be accessible
                 pass
+        
+        # '/' may be missing from the list, e.g. when it is an overlay mount
+        if disk is None:
+            disk = self._get_disk_usage('/')
                 
         return {
             "main_disk": {
                 "total": disk.total,
                 "used": disk.used,
                 "free": disk.free,
-                "percent": disk.percent,
-                "total_formatted": self._format_bytes(disk.total),
-                "used_formatted": self._format_bytes(disk.used),
-                "free_formatted": self._format_bytes(disk.free)
+                "percent": disk.percent
             },
             "io": {
                 "read_bytes": io_counters.read_bytes if io_counters else 0,
-                "write_bytes": io_counters.write_bytes if io_counters else 0,
-                "read_bytes_formatted": self._format_bytes(io_counters.read_bytes) if io_counters else "N/A",
-                "write_bytes_formatted": self._format_bytes(io_counters.write_bytes) if io_counters else "N/A"
+                "write_bytes": io_counters.write_bytes if io_counters else 0
             },
             "partitions": partitions
         }
         
+    def _get_partitions(self):
+        """Get real (non-pseudo) disk partitions, cached for PARTITIONS_TTL."""
+        cached_at, parts = self._parts_cache
+        now = time.monotonic()
+        if parts is None or now - cached_at >= self.PARTITIONS_TTL:
+            parts = [p for p in psutil.disk_partitions() if p.fstype not in self.SKIP_FSTYPES]
+            self._parts_cache = (now, parts)
+            # Forget usage for mounts that have gone away; '/' always stays
+            # since get_disk_info() falls back to it when it is filtered out
+            mountpoints = {p.mountpoint for p in parts}
+            mountpoints.add('/')
+            self._usage_cache = {m: v for m, v in self._usage_cache.items() if m in mountpoints}
+        return parts
+
+    def _get_disk_usage(self, mountpoint):
+        """Get disk usage for a mountpoint, cached for DISK_USAGE_TTL."""
+        now = time.monotonic()
+        cached = self._usage_cache.get(mountpoint)
+        if cached is None or now - cached[0] >= self.DISK_USAGE_TTL:
+            cached = (now, psutil.disk_usage(mountpoint))
+            self._usage_cache[mountpoint] = cached
+        return cached[1]
+
     def get_network_info(self):
         """Get network usage information."""
         net_io = psutil.net_io_counters()
         
-        # Get network interfaces
+        # Get network interfaces; snapshot per-NIC counters once for all of them
+        per_nic = psutil.net_io_counters(pernic=True)
         interfaces = []
         for interface, stats in psutil.net_if_stats().items():
             if stats.isup:  # Only include active interfaces
                 try:
-                    interface_io = psutil.net_io_counters(pernic=True).get(interface)
+                    interface_io = per_nic.get(interface)
                     if interface_io:
                         interfaces.append({
                             "name": interface,
                             "speed": stats.speed,
                             "mtu": stats.mtu,
                             "bytes_sent": interface_io.bytes_sent,
-                            "bytes_recv": interface_io.bytes_recv,
-                            "bytes_sent_formatted": self._format_bytes(interface_io.bytes_sent),
-                            "bytes_recv_formatted": self._format_bytes(interface_io.bytes_recv)
+                            "bytes_recv": interface_io.bytes_recv
                         })
                 except (KeyError, AttributeError):
                     pass
@@ -115,594 +186,251 @@ class SystemMonitor:
                 "bytes_sent": net_io.bytes_sent,
                 "bytes_recv": net_io.bytes_recv,
                 "packets_sent": net_io.packets_sent,
-                "packets_recv": net_io.packets_recv,
-                "bytes_sent_formatted": self._format_bytes(net_io.bytes_sent),
-                "bytes_recv_formatted": self._format_bytes(net_io.bytes_recv)
+                "packets_recv": net_io.packets_recv
             },
             "interfaces": interfaces
         }
         
     def get_process_info(self, top_n=10):
-        """Get information about top processes by CPU usage."""
-        processes = []
-        for proc in sorted(psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'create_time']), 
-                           key=lambda p: p.info['cpu_percent'] or 0, reverse=True)[:top_n]:
+        """Get information about top processes by CPU usage.
+
+        Returns ``{"keys": PROC_KEYS, "rows": [...]}`` with one row per
+        process, its values in PROC_KEYS order.
+        """
+        rows = []
+        # nlargest keeps only top_n entries instead of sorting every process
+        for proc in heapq.nlargest(top_n, psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'create_time']),
+                                   key=lambda p: p.info['cpu_percent'] or 0):
             try:
                 # Get process creation time
-                create_time = datetime.datetime.fromtimestamp(proc.info['create_time']).strftime('%Y-%m-%d %H:%M:%S') if proc.info['create_time'] else "Unknown"
+                create_time = proc.info['create_time']
+                create_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(create_time)) if create_time else "Unknown"
                 
-                # Get memory info in a readable format
-                memory_info = proc.memory_info() if hasattr(proc, 'memory_info') else None
-                rss_formatted = self._format_bytes(memory_info.rss) if memory_info else "Unknown"
+                # Only the top_n survivors need RSS
+                rss = proc.memory_info().rss
                 
-                processes.append({
-                    'pid': proc.info['pid'],
-                    'name': proc.info['name'],
-                    'username': proc.info['username'],
-                    'cpu_percent': proc.info['cpu_percent'],
-                    'memory_percent': round(proc.info['memory_percent'], 1) if proc.info['memory_percent'] else 0,
-                    'memory_rss': rss_formatted,
-                    'create_time': create_time
-                })
+                rows.append((
+                    proc.info['pid'],
+                    proc.info['name'],
+                    proc.info['username'],
+                    proc.info['cpu_percent'],
+                    round(proc.info['memory_percent'], 1) if proc.info['memory_percent'] else 0,
+                    rss,
+                    create_time
+                ))
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
-        return processes
+        return {"keys": PROC_KEYS, "rows": rows}
     
     def _format_bytes(self, bytes_value):
         """Format bytes to human-readable format."""
         if not isinstance(bytes_value, (int, float)):
             return "N/A"
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_value < 1024:
-                return f"{bytes_value:.2f} {unit}"
-            bytes_value /= 1024
-        return f"{bytes_value:.2f} PB"
+        # Each unit covers 10 bits, so the bit length picks the unit directly
+        index = min(max(int(bytes_value).bit_length() - 1, 0) // 10, len(_UNITS) - 1)
+        return f"{bytes_value / (1 << (index * 10)):.2f} {_UNITS[index]}"
     
+    def _with_formatted(self, value):
+        """Return a copy of value with a "*_formatted" string per byte count."""
+        if isinstance(value, list):
+            return [self._with_formatted(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        result = {}
+        for key, item in value.items():
+            result[key] = self._with_formatted(item)
+            if key in FORMATTED_FIELDS and not isinstance(item, dict):
+                result[key + "_formatted"] = self._format_bytes(item)
+        return result
+
+    def dumps_snapshot(self, snapshot, formatted=False):
+        """Serialize a get_all_info() snapshot to JSON bytes.
+
+        The static "system" section is spliced in from its pre-encoded form
+        and everything else is encoded in a single orjson call. With
+        formatted=True human-readable "*_formatted" strings are added next
+        to the raw byte counts.
+        """
+        rest = {key: value for key, value in snapshot.items() if key != "system"}
+        if formatted:
+            processes = rest.pop("processes", None)
+            rest = self._with_formatted(rest)
+            if processes is not None:
+                # Process rows get the formatted RSS as an extra column
+                rss_index = processes["keys"].index('rss')
+                rest["processes"] = {
+                    "keys": processes["keys"] + ('rss_formatted',),
+                    "rows": [row + (self._format_bytes(row[rss_index]),) for row in processes["rows"]]
+                }
+        rest = orjson.dumps(rest)
+        if rest == b"{}":
+            return b'{"system":' + self._system_json + b"}"
+        return b'{"system":' + self._system_json + b"," + rest[1:]
+
     def get_all_info(self):
         """Get all system information."""
+        disk = self._pool.submit(self.get_disk_info)
+        network = self._pool.submit(self.get_network_info)
+        processes = self._pool.submit(self.get_process_info)
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # CPU stays on the calling thread, which holds psutil's baseline
+        cpu = self.get_cpu_info()
+        memory = self.get_memory_info()
         return {
-            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": timestamp,
             "system": self.get_system_info(),
-            "cpu": self.get_cpu_info(),
-            "memory": self.get_memory_info(),
-            "disk": self.get_disk_info(),
-            "network": self.get_network_info(),
-            "processes": self.get_process_info()
+            "cpu": cpu,
+            "memory": memory,
+            "disk": disk.result(),
+            "network": network.result(),
+            "processes": processes.result()
         }
 
-# Create the monitor instance
+class Sampler(threading.Thread):
+    """Background thread that keeps a fresh SystemMonitor snapshot.
+
+    The latest snapshot, its JSON encoding in ``self.snapshot_json`` and the
+    gzipped encoding in ``self.snapshot_gzip`` are published by rebinding
+    attributes, which is atomic in CPython, so request handlers can read them
+    without locking.
+    """
+
+    def __init__(self, monitor, interval=1.0):
+        super().__init__(name="system-sampler", daemon=True)
+        self.monitor = monitor
+        self.interval = interval
+        self._stopped = threading.Event()
+        self.snapshot = None
+        self.snapshot_json = None
+        self.snapshot_gzip = None
+        # Set once the first snapshot is available
+        self.ready = threading.Event()
+
+    def _sample(self):
+        snapshot = self.monitor.get_all_info()
+        snapshot_json = self.monitor.dumps_snapshot(snapshot)
+        # Compress once here rather than on every request for the same bytes
+        self.snapshot_gzip = gzip.compress(snapshot_json, compresslevel=app.config["COMPRESS_LEVEL"])
+        self.snapshot_json = snapshot_json
+        self.snapshot = snapshot
+        self.ready.set()
+
+    def run(self):
+        # Prime psutil's CPU counters so even the first non-blocking sample
+        # covers a full interval
+        psutil.cpu_percent(interval=None, percpu=True)
+        while not self._stopped.wait(self.interval):
+            try:
+                self._sample()
+            except Exception:
+                # Keep serving the last good snapshot rather than dying
+                app.logger.exception("Failed to sample system information")
+
+    def stop(self, timeout=None):
+        """Ask the sampler to exit after its current sample and wait for it.
+
+        A stopped sampler cannot be started again; it is stopped only when
+        the interpreter exits.
+        """
+        self._stopped.set()
+        if self.is_alive():
+            self.join(timeout)
+
+# Create the monitor instance; sampling starts with the server, not on import
 system_monitor = SystemMonitor()
+sampler = Sampler(system_monitor)
+_sampler_lock = threading.Lock()
+# Seconds a request waits for the sampler's first snapshot before giving up
+SNAPSHOT_WAIT = 10.0
+
+@app.before_request
+def start_sampler():
+    """Start the background sampler once; safe to call repeatedly."""
+    # Once the sampler is running this is a lock-free attribute check
+    if sampler.ident is not None:
+        return
+    with _sampler_lock:
+        if sampler.ident is None:
+            sampler.start()
+            # Let an in-flight sample finish instead of dying mid-collection
+            atexit.register(sampler.stop, timeout=2 * sampler.interval)
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def _json_response(obj):
+    """Wrap obj (or already-encoded JSON bytes) in a JSON response."""
+    if not isinstance(obj, bytes):
+        obj = orjson.dumps(obj)
+    return Response(obj, mimetype="application/json")
+
 @app.route('/api/system_info')
 def api_system_info():
-    return jsonify(system_monitor.get_all_info())
+    if not sampler.ready.wait(SNAPSHOT_WAIT):
+        return Response(status=503)
+    # Human-readable "*_formatted" fields are opt-in via ?format=1
+    if request.args.get('format') == '1':
+        return _json_response(system_monitor.dumps_snapshot(sampler.snapshot, formatted=True))
+    if request.accept_encodings.quality('gzip') > 0:
+        # Already gzipped by the sampler; flask-compress skips responses that
+        # carry a Content-Encoding and only adds the Vary header
+        response = _json_response(sampler.snapshot_gzip)
+        response.headers["Content-Encoding"] = "gzip"
+        return response
+    return _json_response(sampler.snapshot_json)
 
-# Create templates directory and index.html if they don't exist
-def create_templates():
-    if not os.path.exists('templates'):
-        os.makedirs('templates')
-        
-    index_html = '''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>System Monitor Dashboard</title>
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/bootstrap/5.3.0/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
-    <style>
-        body {
-            background-color: #f8f9fa;
-            padding-top: 20px;
-        }
-        .card {
-            margin-bottom: 20px;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }
-        .card-header {
-            background-color: #007bff;
-            color: white;
-            border-radius: 10px 10px 0 0 !important;
-            font-weight: bold;
-        }
-        .system-info {
-            background-color: #f1f1f1;
-            padding: 10px;
-            border-radius: 5px;
-            margin-bottom: 15px;
-        }
-        .gauge-container {
-            width: 100%;
-            height: 150px;
-            position: relative;
-            margin: 0 auto;
-        }
-        .gauge {
-            width: 100%;
-            height: 100%;
-        }
-        .process-table {
-            font-size: 0.85rem;
-        }
-        .progress {
-            height: 20px;
-            margin-bottom: 10px;
-        }
-        .refresh-control {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            margin-bottom: 20px;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1 class="text-center mb-4">System Monitor Dashboard</h1>
-        
-        <div class="refresh-control">
-            <label for="refresh-rate" class="me-2">Refresh rate:</label>
-            <select id="refresh-rate" class="form-select form-select-sm" style="width:auto">
-                <option value="1000">1 second</option>
-                <option value="2000" selected>2 seconds</option>
-                <option value="5000">5 seconds</option>
-                <option value="10000">10 seconds</option>
-                <option value="30000">30 seconds</option>
-            </select>
-            <span class="ms-3">Last updated: <span id="last-update">Never</span></span>
-        </div>
-        
-        <div class="row">
-            <!-- System Info Card -->
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        <i class="fas fa-server me-2"></i>System Information
-                    </div>
-                    <div class="card-body">
-                        <div class="system-info">
-                            <div id="system-details"></div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <!-- CPU Card -->
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        <i class="fas fa-microchip me-2"></i>CPU Usage
-                    </div>
-                    <div class="card-body">
-                        <div class="gauge-container">
-                            <canvas id="cpu-gauge" class="gauge"></canvas>
-                        </div>
-                        <div id="cpu-info" class="mt-3"></div>
-                        <div id="per-cpu" class="mt-3"></div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="row">
-            <!-- Memory Card -->
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        <i class="fas fa-memory me-2"></i>Memory Usage
-                    </div>
-                    <div class="card-body">
-                        <div class="gauge-container">
-                            <canvas id="memory-gauge" class="gauge"></canvas>
-                        </div>
-                        <div id="memory-info" class="mt-3"></div>
-                    </div>
-                </div>
-            </div>
-            
-            <!-- Disk Card -->
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        <i class="fas fa-hdd me-2"></i>Disk Usage
-                    </div>
-                    <div class="card-body">
-                        <div class="gauge-container">
-                            <canvas id="disk-gauge" class="gauge"></canvas>
-                        </div>
-                        <div id="disk-info" class="mt-3"></div>
-                        <div id="disk-partitions" class="mt-3"></div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="row">
-            <!-- Network Card -->
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        <i class="fas fa-network-wired me-2"></i>Network
-                    </div>
-                    <div class="card-body">
-                        <div id="network-info"></div>
-                        <div id="network-interfaces" class="mt-3"></div>
-                    </div>
-                </div>
-            </div>
-            
-            <!-- Processes Card -->
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        <i class="fas fa-tasks me-2"></i>Top Processes
-                    </div>
-                    <div class="card-body">
-                        <div class="table-responsive">
-                            <table class="table table-striped table-sm process-table">
-                                <thead>
-                                    <tr>
-                                        <th>PID</th>
-                                        <th>Name</th>
-                                        <th>User</th>
-                                        <th>CPU %</th>
-                                        <th>Memory %</th>
-                                        <th>Memory</th>
-                                    </tr>
-                                </thead>
-                                <tbody id="processes-body">
-                                </tbody>
-                            </table>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
+# Worker threads for waitress. Each open stream holds one, so only half of
+# them may stream and the rest stay free for pages and plain API requests.
+SERVER_THREADS = 8
+MAX_STREAMS = SERVER_THREADS // 2
+_stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+# A stream ends after this many events and the browser reconnects after
+# STREAM_RETRY_MS, so no worker is held indefinitely
+STREAM_MAX_EVENTS = 60
+STREAM_RETRY_MS = 1000
+# Reconnect delay for clients turned away because every slot is taken
+STREAM_BUSY_RETRY_MS = 5000
 
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/jquery/3.6.0/jquery.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/bootstrap/5.3.0/js/bootstrap.bundle.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/Chart.js/3.9.1/chart.min.js"></script>
-    
-    <script>
-        // Define gauge chart objects
-        let cpuGauge, memoryGauge, diskGauge;
-        
-        // Initialize the charts
-        function initCharts() {
-            // CPU Gauge
-            const cpuContext = document.getElementById('cpu-gauge').getContext('2d');
-            cpuGauge = new Chart(cpuContext, {
-                type: 'doughnut',
-                data: {
-                    labels: ['Used', 'Free'],
-                    datasets: [{
-                        data: [0, 100],
-                        backgroundColor: ['#dc3545', '#e9ecef'],
-                        borderWidth: 0
-                    }]
-                },
-                options: {
-                    circumference: 180,
-                    rotation: -90,
-                    cutout: '70%',
-                    plugins: {
-                        legend: {
-                            display: false
-                        },
-                        tooltip: {
-                            enabled: false
-                        }
-                    },
-                    maintainAspectRatio: false
-                }
-            });
-            
-            // Memory Gauge
-            const memoryContext = document.getElementById('memory-gauge').getContext('2d');
-            memoryGauge = new Chart(memoryContext, {
-                type: 'doughnut',
-                data: {
-                    labels: ['Used', 'Free'],
-                    datasets: [{
-                        data: [0, 100],
-                        backgroundColor: ['#fd7e14', '#e9ecef'],
-                        borderWidth: 0
-                    }]
-                },
-                options: {
-                    circumference: 180,
-                    rotation: -90,
-                    cutout: '70%',
-                    plugins: {
-                        legend: {
-                            display: false
-                        },
-                        tooltip: {
-                            enabled: false
-                        }
-                    },
-                    maintainAspectRatio: false
-                }
-            });
-            
-            // Disk Gauge
-            const diskContext = document.getElementById('disk-gauge').getContext('2d');
-            diskGauge = new Chart(diskContext, {
-                type: 'doughnut',
-                data: {
-                    labels: ['Used', 'Free'],
-                    datasets: [{
-                        data: [0, 100],
-                        backgroundColor: ['#28a745', '#e9ecef'],
-                        borderWidth: 0
-                    }]
-                },
-                options: {
-                    circumference: 180,
-                    rotation: -90,
-                    cutout: '70%',
-                    plugins: {
-                        legend: {
-                            display: false
-                        },
-                        tooltip: {
-                            enabled: false
-                        }
-                    },
-                    maintainAspectRatio: false
-                }
-            });
-        }
-        
-        // Update gauge charts with new data
-        function updateGauges(data) {
-            // Update CPU gauge
-            cpuGauge.data.datasets[0].data = [data.cpu.cpu_percent, 100 - data.cpu.cpu_percent];
-            cpuGauge.update();
-            
-            // Update Memory gauge
-            memoryGauge.data.datasets[0].data = [data.memory.percent, 100 - data.memory.percent];
-            memoryGauge.update();
-            
-            // Update Disk gauge
-            diskGauge.data.datasets[0].data = [data.disk.main_disk.percent, 100 - data.disk.main_disk.percent];
-            diskGauge.update();
-        }
-        
-        // Update the system information panel
-        function updateSystemInfo(data) {
-            const sysInfo = data.system;
-            let html = `
-                <p><strong>OS:</strong> ${sysInfo.system} ${sysInfo.release}</p>
-                <p><strong>Hostname:</strong> ${sysInfo.node}</p>
-                <p><strong>Architecture:</strong> ${sysInfo.machine}</p>
-                <p><strong>Processor:</strong> ${sysInfo.processor}</p>
-            `;
-            $("#system-details").html(html);
-        }
-        
-        // Update CPU information
-        function updateCpuInfo(data) {
-            const cpuInfo = data.cpu;
-            let html = `
-                <div class="text-center mb-3">
-                    <span class="display-4">${cpuInfo.cpu_percent}%</span>
-                </div>
-                <p><strong>CPU Count:</strong> ${cpuInfo.cpu_count}</p>
-                <p><strong>CPU Frequency:</strong> ${cpuInfo.cpu_freq} MHz</p>
-            `;
-            $("#cpu-info").html(html);
-            
-            // Per CPU display
-            let perCpuHtml = `<h6>Per CPU Usage:</h6>`;
-            cpuInfo.per_cpu.forEach((usage, index) => {
-                perCpuHtml += `
-                <div class="mb-1">
-                    <small>CPU ${index}:</small>
-                    <div class="progress">
-                        <div class="progress-bar ${getProgressBarColor(usage)}" 
-                             role="progressbar" 
-                             style="width: ${usage}%" 
-                             aria-valuenow="${usage}" 
-                             aria-valuemin="0" 
-                             aria-valuemax="100">
-                            ${usage.toFixed(1)}%
-                        </div>
-                    </div>
-                </div>
-                `;
-            });
-            $("#per-cpu").html(perCpuHtml);
-        }
-        
-        // Update Memory information
-        function updateMemoryInfo(data) {
-            const memInfo = data.memory;
-            let html = `
-                <div class="text-center mb-3">
-                    <span class="display-4">${memInfo.percent}%</span>
-                </div>
-                <p><strong>Total:</strong> ${memInfo.total_formatted}</p>
-                <p><strong>Used:</strong> ${memInfo.used_formatted}</p>
-                <p><strong>Available:</strong> ${memInfo.available_formatted}</p>
-                <div class="progress">
-                    <div class="progress-bar bg-warning" 
-                         role="progressbar" 
-                         style="width: ${memInfo.percent}%" 
-                         aria-valuenow="${memInfo.percent}" 
-                         aria-valuemin="0" 
-                         aria-valuemax="100">
-                        ${memInfo.percent}%
-                    </div>
-                </div>
-            `;
-            $("#memory-info").html(html);
-        }
-        
-        // Update Disk information
-        function updateDiskInfo(data) {
-            const diskInfo = data.disk.main_disk;
-            let html = `
-                <div class="text-center mb-3">
-                    <span class="display-4">${diskInfo.percent}%</span>
-                </div>
-                <p><strong>Total:</strong> ${diskInfo.total_formatted}</p>
-                <p><strong>Used:</strong> ${diskInfo.used_formatted}</p>
-                <p><strong>Free:</strong> ${diskInfo.free_formatted}</p>
-                <div class="progress">
-                    <div class="progress-bar bg-success" 
-                         role="progressbar" 
-                         style="width: ${diskInfo.percent}%" 
-                         aria-valuenow="${diskInfo.percent}" 
-                         aria-valuemin="0" 
-                         aria-valuemax="100">
-                        ${diskInfo.percent}%
-                    </div>
-                </div>
-            `;
-            $("#disk-info").html(html);
-            
-            // Partitions info
-            if (data.disk.partitions.length > 0) {
-                let partitionsHtml = `<h6>Disk Partitions:</h6>`;
-                data.disk.partitions.forEach(partition => {
-                    partitionsHtml += `
-                    <div class="mb-2">
-                        <small>${partition.mountpoint} (${partition.fstype}):</small>
-                        <div class="progress">
-                            <div class="progress-bar bg-success" 
-                                role="progressbar" 
-                                style="width: ${partition.percent}%" 
-                                aria-valuenow="${partition.percent}" 
-                                aria-valuemin="0" 
-                                aria-valuemax="100">
-                                ${partition.percent}%
-                            </div>
-                        </div>
-                        <small>${partition.used_formatted} of ${partition.total_formatted}</small>
-                    </div>
-                    `;
-                });
-                $("#disk-partitions").html(partitionsHtml);
-            }
-        }
-        
-        // Update Network information
-        function updateNetworkInfo(data) {
-            const netInfo = data.network.total;
-            let html = `
-                <h5 class="mb-3">Network Traffic</h5>
-                <p><strong>Total Sent:</strong> ${netInfo.bytes_sent_formatted}</p>
-                <p><strong>Total Received:</strong> ${netInfo.bytes_recv_formatted}</p>
-                <p><strong>Packets Sent:</strong> ${netInfo.packets_sent.toLocaleString()}</p>
-                <p><strong>Packets Received:</strong> ${netInfo.packets_recv.toLocaleString()}</p>
-            `;
-            $("#network-info").html(html);
-            
-            // Network interfaces
-            if (data.network.interfaces.length > 0) {
-                let interfacesHtml = `<h6>Network Interfaces:</h6>`;
-                data.network.interfaces.forEach(iface => {
-                    interfacesHtml += `
-                    <div class="mb-2">
-                        <p><strong>${iface.name}</strong> (${iface.speed} Mbps, MTU: ${iface.mtu})</p>
-                        <p>Sent: ${iface.bytes_sent_formatted} | Received: ${iface.bytes_recv_formatted}</p>
-                    </div>
-                    `;
-                });
-                $("#network-interfaces").html(interfacesHtml);
-            }
-        }
-        
-        // Update Processes table
-        function updateProcesses(data) {
-            const processes = data.processes;
-            let tableHtml = "";
-            
-            processes.forEach(proc => {
-                tableHtml += `
-                <tr>
-                    <td>${proc.pid}</td>
-                    <td title="${proc.name}">${proc.name.length > 15 ? proc.name.substring(0, 15) + '...' : proc.name}</td>
-                    <td>${proc.username}</td>
-                    <td>${proc.cpu_percent.toFixed(1)}%</td>
-                    <td>${proc.memory_percent.toFixed(1)}%</td>
-                    <td>${proc.memory_rss}</td>
-                </tr>
-                `;
-            });
-            
-            $("#processes-body").html(tableHtml);
-        }
-        
-        // Get color for progress bar based on value
-        function getProgressBarColor(value) {
-            if (value < 60) return "bg-success";
-            if (value < 85) return "bg-warning";
-            return "bg-danger";
-        }
-        
-        // Refresh data from API
-        function refreshData() {
-            $.ajax({
-                url: '/api/system_info',
-                type: 'GET',
-                dataType: 'json',
-                success: function(data) {
-                    // Update last update time
-                    $("#last-update").text(data.timestamp);
-                    
-                    // Update all components
-                    updateSystemInfo(data);
-                    updateCpuInfo(data);
-                    updateMemoryInfo(data);
-                    updateDiskInfo(data);
-                    updateNetworkInfo(data);
-                    updateProcesses(data);
-                    updateGauges(data);
-                },
-                error: function() {
-                    console.error("Failed to fetch system information");
-                }
-            });
-        }
-        
-        // Document ready
-        $(document).ready(function() {
-            // Initialize charts
-            initCharts();
-            
-            // Initial data load
-            refreshData();
-            
-            // Set up refresh timer
-            let refreshInterval = parseInt($("#refresh-rate").val());
-            let refreshTimer = setInterval(refreshData, refreshInterval);
-            
-            // Handle refresh rate change
-            $("#refresh-rate").change(function() {
-                clearInterval(refreshTimer);
-                refreshInterval = parseInt($(this).val());
-                refreshTimer = setInterval(refreshData, refreshInterval);
-            });
-        });
-    </script>
-</body>
-</html>
-    '''
-    
-    with open('templates/index.html', 'w') as f:
-        f.write(index_html)
+@app.route('/api/system_info/stream')
+def api_system_info_stream():
+    """Push each new sampler snapshot to the client as a Server-Sent Event."""
+    def generate():
+        if not sampler.ready.wait(SNAPSHOT_WAIT):
+            return
+        if not _stream_slots.acquire(blocking=False):
+            # All slots taken: send one snapshot and have the client retry
+            # later. An error status would stop EventSource reconnecting.
+            yield b"retry: %d\ndata: %s\n\n" % (STREAM_BUSY_RETRY_MS, sampler.snapshot_json)
+            return
+        try:
+            yield b"retry: %d\n\n" % STREAM_RETRY_MS
+            last_sent = None
+            sent = 0
+            while True:
+                payload = sampler.snapshot_json
+                if payload is not last_sent:
+                    last_sent = payload
+                    yield b"data: " + payload + b"\n\n"
+                    sent += 1
+                    if sent >= STREAM_MAX_EVENTS:
+                        return
+                time.sleep(sampler.interval)
+        finally:
+            _stream_slots.release()
+
+    return Response(generate(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 if __name__ == '__main__':
-    create_templates()
     print("System Monitor Dashboard is starting...")
     print("Access the dashboard at http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0')
\ No newline at end of file
+    if os.environ.get("DEBUG"):
+        # Werkzeug's single-threaded dev server with reloader and debugger.
+        # The sampler starts on the first request, so the reloader's watcher
+        # process never runs one.
+        app.run(debug=True, host='0.0.0.0')
+    else:
+        from waitress import serve
+        start_sampler()
+        serve(app, host='0.0.0.0', port=5000, threads=SERVER_THREADS)
\ No newline at end of file